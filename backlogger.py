@@ -6,6 +6,7 @@ import json
 from statistics import mean
 from datetime import datetime, timedelta
 from inspect import getmembers, isfunction
+from functools import lru_cache
 import calendar
 import requests
 from requests.adapters import HTTPAdapter
@@ -24,16 +25,44 @@ reminder_regex = (
     r"^This ticket was set to .* priority but was not updated.* Please consider"
 )
 
-present = datetime.now()
-slo_priorities = {
-    "Immediate": {"period": timedelta(days=1),
-                  "next_priority": {"id": 6, "name": "Urgent"}}, #or <1 day for all subprojects of qa
-    "Urgent": {"period": timedelta(weeks=1),
-               "next_priority": {"id": 5, "name": "High"}}, #or <1 day for all subprojects of qa
-    "High": {"period": timedelta(days=calendar.monthrange(present.year, present.month)[1]),
-             "next_priority": {"id": 4, "name": "Normal"}},
-    "Normal": {"period": timedelta(days=sum([calendar.monthrange(present.year, m)[1] for m in range(1,13)])),
-               "next_priority": {"id": 3, "name": "Low"}}}
+# Default SLO per priority, can be overridden with "slo" in the configuration
+default_slo = {
+    "Immediate": {"period": "day", "next_priority": "Urgent"}, #or <1 day for all subprojects of qa
+    "Urgent": {"period": "week", "next_priority": "High"}, #or <1 day for all subprojects of qa
+    "High": {"period": "month", "next_priority": "Normal"},
+    "Normal": {"period": "year", "next_priority": "Low"}}
+
+
+def slo_period(period, now):
+    # Calendar based periods depend on the current date so they are computed on each evaluation
+    if period == "day":
+        return timedelta(days=1)
+    if period == "week":
+        return timedelta(weeks=1)
+    if period == "month":
+        return timedelta(days=calendar.monthrange(now.year, now.month)[1])
+    if period == "year":
+        return timedelta(days=sum([calendar.monthrange(now.year, m)[1] for m in range(1,13)]))
+    return timedelta(days=period)
+
+
+def validate_slo(slo):
+    if not isinstance(slo, dict):
+        sys.exit("Invalid slo configuration: expected a mapping of priority names")
+    for priority, conf in slo.items():
+        if not isinstance(conf, dict):
+            sys.exit("Invalid slo configuration for {}: expected period and next_priority".format(priority))
+        period = conf.get("period")
+        if period not in ("day", "week", "month", "year") and not (
+                isinstance(period, int) and not isinstance(period, bool) and period > 0):
+            sys.exit("Invalid slo period for {}: {!r}, expected day, week, month, year or a positive number of days".format(
+                priority, period))
+        if not isinstance(conf.get("next_priority"), str):
+            sys.exit("Invalid slo configuration for {}: next_priority must be a priority name".format(priority))
+
+
+def slo_priorities():
+    return data.get("slo", default_slo)
 
 
 # Initialize a blank md file to replace the current README
@@ -62,7 +91,32 @@ def retry_request(method, url, data, headers, attempts=7):
     return http.request(method, url, data=data, headers=headers)
 
 
-def json_rest(method, url, rest=None):
+class Issue:
+    """Compact record of the issue fields used from query listings"""
+
+    __slots__ = ("id", "status", "priority", "created_on", "updated_on")
+
+    def __init__(self, fields):
+        for name in self.__slots__:
+            if name in fields:
+                setattr(self, name, fields[name])
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+
+def _compact_issue(obj):
+    # Relies on Redmine always sending these keys for issues in a listing, nested
+    # objects like status, priority or custom fields never carry all of them
+    if {"id", "subject", "tracker", "status", "priority"} <= obj.keys():
+        return Issue(obj)
+    return obj
+
+
+def json_rest(method, url, rest=None, compact=False):
     text = json.dumps(rest)
     try:
         key = os.environ["REDMINE_API_KEY"]
@@ -75,7 +129,9 @@ def json_rest(method, url, rest=None):
     }
     r = retry_request(method, url, data=text, headers=headers)
     r.raise_for_status()
-    return r.json() if r.text else None
+    if not r.content:
+        return None
+    return r.json(object_hook=_compact_issue) if compact else r.json()
 
 
 def issue_reminder(conf, poo, poo_reminder_state):
@@ -91,8 +147,8 @@ def issue_reminder(conf, poo, poo_reminder_state):
             return
         elif reminder_exists(poo, journals, poo_reminder_state):
             print("Skipping reminder for {}: a similar reminder already exists".format(poo["id"]))
-            if priority == "Low" and poo_reminder_state['has_repeat_reminder']:
-                print("Skipping priority update for {}, already at lowest".format(poo["id"]))
+            if priority not in slo_priorities() and poo_reminder_state['has_repeat_reminder']:
+                print("Skipping priority update for {}, no SLO for priority {}".format(poo["id"], priority))
                 return
             _update_issue_priority(poo["id"], priority, poo_reminder_state, msg)
             return
@@ -106,20 +162,39 @@ def _send_first_reminder(poo_id, msg):
 
 
 def _update_issue_priority(poo_id, priority_current, poo_reminder_state, msg):
-    if poo_reminder_state['has_repeat_reminder'] and (poo_reminder_state['last_reminder'] + slo_priorities[priority_current]["period"]) < present:
+    slo = slo_priorities()
+    if not poo_reminder_state['has_repeat_reminder'] or priority_current not in slo:
+        return
+    now = datetime.now()
+    if (poo_reminder_state['last_reminder'] + slo_period(slo[priority_current]["period"], now)) < now:
+        priority_next = slo[priority_current]["next_priority"]
         note = "No response to reminder. Reducing priority from {} to next lower {} for {}"
-        print(note.format(priority_current,
-                         slo_priorities[priority_current]["next_priority"]["name"],
-                         poo_id))
+        print(note.format(priority_current, priority_next, poo_id))
         url = "{}/{}.json".format(data["web"], poo_id)
         msg = " ".join([reminder_text_common.format(priority=priority_current, url=data["url"]), update_slo_text.format(
-            priority=slo_priorities[priority_current]["next_priority"]["name"])])
+            priority=priority_next)])
         json_rest("PUT", url,
                   {"issue":
-                   {"priority_id": slo_priorities[priority_current]["next_priority"]["id"],
+                   {"priority_id": issue_priorities(data["api"])[priority_next],
                     "notes": msg}})
 
 
+@lru_cache(maxsize=None)
+def issue_priorities(api):
+    url = remove_project_part_from_url(api).replace("issues", "enumerations/issue_priorities")
+    root = json_rest("GET", url)
+    return {priority["name"]: priority["id"] for priority in root["issue_priorities"]}
+
+
+def check_next_priorities():
+    # Entries for priorities the instance doesn't have can never apply to a ticket
+    priority_ids = issue_priorities(data["api"])
+    for priority, conf in slo_priorities().items():
+        if priority in priority_ids and conf["next_priority"] not in priority_ids:
+            sys.exit("Unknown priority {} configured as next_priority for {}".format(
+                conf["next_priority"], priority))
+
+
 def list_issues(conf, root):
     try:
         for poo in root["issues"]:
@@ -162,7 +237,7 @@ def failure_more(conf):
 
 
 def check_backlog(conf):
-    root = json_rest("GET", data["api"] + "?" + conf["query"])
+    root = json_rest("GET", data["api"] + "?" + conf["query"], compact=True)
     issue_count = list_issues(conf, root)
     good = True
     if "max" in conf:
@@ -234,7 +309,7 @@ def render_influxdb(data):
         status_ids[status["name"]] = status["id"]
 
     for conf in data["queries"]:
-        root = json_rest("GET", data["api"] + "?" + conf["query"] + "&limit=100")
+        root = json_rest("GET", data["api"] + "?" + conf["query"] + "&limit=100", compact=True)
         issue_count = list_issues(conf, root)
         status_names = []
         result = {}
@@ -341,6 +416,9 @@ if __name__ == "__main__":
         with open(switches.config, "r") as config:
             data = yaml.safe_load(config)
             data["reminder-comment-on-issues"] = switches.reminder_comment_on_issues
+            validate_slo(data.get("slo", {}))
+            if switches.reminder_comment_on_issues:
+                check_next_priorities()
             if switches.output == "influxdb":
                 print("\n".join(line for line in render_influxdb(data)))
             else:
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Compare decoding a large issue listing into full dicts against compact records,
+# going through json_rest including the response body
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import backlogger
+from test_output import make_response
+
+
+def listing(count):
+    issue = {
+        "project": {"id": 1, "name": "openQA Project"},
+        "tracker": {"id": 4, "name": "action"},
+        "status": {"id": 2, "name": "In Progress"},
+        "priority": {"id": 4, "name": "Normal"},
+        "author": {"id": 3, "name": "Jane Doe"},
+        "subject": "Investigate failing tests",
+        "description": "Lorem ipsum dolor sit amet. " * 40,
+        "custom_fields": [{"id": i, "name": "Field {}".format(i), "value": "x" * 20} for i in range(8)],
+        "created_on": "2022-12-12T07:51:24Z",
+        "updated_on": "2022-12-19T12:34:52Z",
+    }
+    issues = [dict(issue, id=i) for i in range(count)]
+    return json.dumps({"issues": issues, "total_count": count, "offset": 0, "limit": count}).encode()
+
+
+def fetch(body, compact):
+    with patch.object(backlogger, "retry_request", return_value=make_response(body)):
+        return backlogger.json_rest("GET", "https://example.com/issues.json", compact=compact)
+
+
+def measure(name, body, compact):
+    # The body itself is allocated before tracing starts, peak covers reading and decoding it
+    # while retained only counts the decoded data once the response is gone
+    tracemalloc.start()
+    root = fetch(body, compact)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del root
+    seconds = min(timeit.repeat(lambda: fetch(body, compact), number=5, repeat=5)) / 5
+    print("{:<8} {:8.1f} ms  peak {:8.1f} KiB  retained {:8.1f} KiB".format(
+        name, seconds * 1000, peak / 1024, retained / 1024))
+
+
+if __name__ == "__main__":
+    body = listing(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
+    os.environ.setdefault("REDMINE_API_KEY", "benchmark")
+    backlogger.data = {"url": "https://example.com"}
+    measure("full", body, compact=False)
+    measure("compact", body, compact=True)
@@ -130,6 +130,10 @@ class TestComments(unittest.TestCase):
                     "GET",
                     "https://example.com/wiki/1000.json?include=journals",
                 ),
+                call(
+                    "GET",
+                    "https://example.com/enumerations/issue_priorities.json",
+                ),
                 call(
                     "PUT",
                     "https://example.com/wiki/1000.json",
@@ -163,11 +167,109 @@ class TestComments(unittest.TestCase):
             backlogger.json_rest.assert_has_calls(calls)
 
 
-    def _test_issue_reminder(self, prio_from, past_days):
+    def test_configured_slo(self):
+        slo = {"High": {"period": 3, "next_priority": "Low"}}
+        self._test_issue_reminder(prio_from="High", past_days=2, slo=slo)
+        out, err = self.capsys.readouterr()
+        assert not re.search("Reducing priority", out)
+        self._test_issue_reminder(prio_from="High", past_days=5, slo=slo)
+        out, err = self.capsys.readouterr()
+        assert re.search("Reducing priority from High to next lower Low for 1000", out)
+        backlogger.json_rest.assert_called_with(
+            "PUT",
+            "https://example.com/wiki/1000.json",
+            {
+                "issue": {
+                    "priority_id": 3,
+                    "notes": "This ticket was set to **High** priority but was not updated [within the SLO period](https://example.com/issues). The ticket will be set to the next lower priority **Low**."
+                }
+            },
+        )
+        # a configured table replaces the defaults
+        self._test_issue_reminder(prio_from="Normal", past_days=700, slo=slo)
+        out, err = self.capsys.readouterr()
+        assert re.search("Skipping priority update for 1000, no SLO for priority Normal", out)
+
+
+    def test_unknown_next_priority(self):
+        backlogger.data = {"api": "https://example.com/issues.json",
+                           "slo": {"P1": {"period": "week", "next_priority": "P9"}}}
+        backlogger.issue_priorities.cache_clear()
+        backlogger.json_rest = MagicMock(return_value=self.custom_priorities)
+        with self.assertRaisesRegex(SystemExit, "Unknown priority P9 configured as next_priority for P1"):
+            backlogger.check_next_priorities()
+        backlogger.json_rest.assert_called_once_with(
+            "GET", "https://example.com/enumerations/issue_priorities.json")
+
+
+    def test_custom_priorities(self):
+        slo = {"P1": {"period": "week", "next_priority": "P2"},
+               "P2": {"period": "month", "next_priority": "P3"},
+               # not present on the instance so never checked
+               "Urgent": {"period": "day", "next_priority": "High"}}
+        backlogger.data = {"api": "https://example.com/issues.json", "slo": slo}
+        backlogger.issue_priorities.cache_clear()
+        backlogger.json_rest = MagicMock(return_value=self.custom_priorities)
+        backlogger.check_next_priorities()
+        self._test_issue_reminder(prio_from="P1", past_days=10, slo=slo,
+                                  priorities=self.custom_priorities)
+        out, err = self.capsys.readouterr()
+        assert re.search("Reducing priority from P1 to next lower P2 for 1000", out)
+        backlogger.json_rest.assert_called_with(
+            "PUT",
+            "https://example.com/wiki/1000.json",
+            {
+                "issue": {
+                    "priority_id": 12,
+                    "notes": "This ticket was set to **P1** priority but was not updated [within the SLO period](https://example.com/issues). The ticket will be set to the next lower priority **P2**."
+                }
+            },
+        )
+
+
+    def test_validate_slo(self):
+        backlogger.validate_slo({})
+        backlogger.validate_slo({"High": {"period": "month", "next_priority": "Normal"},
+                                 "Normal": {"period": 90, "next_priority": "Low"}})
+        invalid = [
+            (None, "expected a mapping"),
+            ({"High": "month"}, "for High: expected period and next_priority"),
+            ({"High": {"period": "months", "next_priority": "Normal"}}, "Invalid slo period for High: 'months'"),
+            ({"High": {"period": 0, "next_priority": "Normal"}}, "Invalid slo period for High: 0"),
+            ({"High": {"period": True, "next_priority": "Normal"}}, "Invalid slo period for High: True"),
+            ({"High": {"period": "month"}}, "for High: next_priority must be a priority name"),
+        ]
+        for slo, message in invalid:
+            with self.subTest(slo=slo), self.assertRaisesRegex(SystemExit, message):
+                backlogger.validate_slo(slo)
+
+
+    def test_slo_period(self):
+        self.assertEqual(backlogger.slo_period("day", datetime(2024, 2, 10)), timedelta(days=1))
+        self.assertEqual(backlogger.slo_period("week", datetime(2024, 2, 10)), timedelta(weeks=1))
+        self.assertEqual(backlogger.slo_period("month", datetime(2024, 2, 10)), timedelta(days=29))
+        self.assertEqual(backlogger.slo_period("month", datetime(2023, 2, 10)), timedelta(days=28))
+        self.assertEqual(backlogger.slo_period("year", datetime(2024, 2, 10)), timedelta(days=366))
+        self.assertEqual(backlogger.slo_period(14, datetime(2024, 2, 10)), timedelta(days=14))
+
+
+    custom_priorities = {
+        "issue_priorities": [
+            {"id": 11, "name": "P1"},
+            {"id": 12, "name": "P2"},
+            {"id": 13, "name": "P3"},
+        ],
+    }
+
+
+    def _test_issue_reminder(self, prio_from, past_days, slo=None, priorities=None):
         data = {"url": "https://example.com/issues", "web": "https://example.com/wiki",
-                "api": "https://example.com/issues.json",
+                "api": "https://example.com/projects/foo/issues.json",
                 "reminder-comment-on-issues": True}
+        if slo is not None:
+            data["slo"] = slo
         backlogger.data = data
+        backlogger.issue_priorities.cache_clear()
         rest = {
             "issue": {
                 "id": 1000,
@@ -183,7 +285,20 @@ class TestComments(unittest.TestCase):
             },
         }
 
-        backlogger.json_rest = MagicMock(return_value=rest)
+        priorities = priorities or {
+            "issue_priorities": [
+                {"id": 3, "name": "Low"},
+                {"id": 4, "name": "Normal"},
+                {"id": 5, "name": "High"},
+                {"id": 6, "name": "Urgent"},
+                {"id": 7, "name": "Immediate"},
+            ],
+        }
+
+        def rest_side_effect(method, url, *args):
+            return priorities if "issue_priorities" in url else rest
+
+        backlogger.json_rest = MagicMock(side_effect=rest_side_effect)
         backlogger.issue_reminder(
             {"query": "query_id=123&c%5B%5D=updated_on"},
             {"priority": {"name": prio_from}, "id": 1000},
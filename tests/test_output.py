@@ -1,12 +1,20 @@
+import gzip
+import io
+import json
 import os
 import sys
 import unittest
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
+import requests
+from urllib3.response import HTTPResponse
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import backlogger
 
+# Other tests replace json_rest with mocks
+real_json_rest = backlogger.json_rest
+
 
 class TestOutput(unittest.TestCase):
     def setUp(self):
@@ -14,6 +22,7 @@ class TestOutput(unittest.TestCase):
             "api": "https://example.com/issues.json",
             "web": "https://example.com/issues",
             "team": "Awesome Team",
+            "url": "https://example.com/wiki",
             "queries": [{"title": "Workable Backlog", "query": "query_id=123"}],
         }
         backlogger.data = data
@@ -142,3 +151,56 @@ class TestOutput(unittest.TestCase):
                     ],
                 ],
             )
+
+    def test_compact_issues(self):
+        payload = """{"issues": [{"id": 1, "subject": "Foo", "description": "Lorem ipsum",
+                        "tracker": {"id": 4, "name": "action"},
+                        "status": {"id": 2, "name": "In Progress"},
+                        "priority": {"id": 4, "name": "Normal"},
+                        "custom_fields": [{"id": 7, "name": "Bar", "value": "baz",
+                                           "subject": "not an issue"}],
+                        "created_on": "2022-12-12T07:51:24Z",
+                        "updated_on": "2022-12-19T12:34:52Z"}],
+                      "total_count": 1}"""
+        root = json.loads(payload, object_hook=backlogger._compact_issue)
+        issue = root["issues"][0]
+        self.assertIsInstance(issue, backlogger.Issue)
+        self.assertEqual(issue["id"], 1)
+        self.assertEqual(issue["status"]["name"], "In Progress")
+        self.assertEqual(issue["priority"]["name"], "Normal")
+        self.assertEqual(issue["created_on"], "2022-12-12T07:51:24Z")
+        self.assertEqual(issue["updated_on"], "2022-12-19T12:34:52Z")
+        self.assertFalse(hasattr(issue, "__dict__"))
+        with self.assertRaises(KeyError):
+            issue["description"]
+        self.assertEqual(root["total_count"], 1)
+
+    def test_json_rest_compact(self):
+        payload = json.dumps({"issues": [{"id": 1, "subject": "Foo", "description": "Lorem ipsum",
+                                          "tracker": {"id": 4, "name": "action"},
+                                          "status": {"id": 2, "name": "Resolved"},
+                                          "priority": {"id": 4, "name": "Normal"}}],
+                              "total_count": 1}).encode()
+        for encoding, body in [(None, payload), ("gzip", gzip.compress(payload))]:
+            with self.subTest(encoding=encoding), \
+                    patch.dict(os.environ, {"REDMINE_API_KEY": "secret"}), \
+                    patch.object(backlogger, "retry_request", return_value=make_response(body, encoding)):
+                root = real_json_rest("GET", "https://example.com/issues.json", compact=True)
+                issue = root["issues"][0]
+                self.assertIsInstance(issue, backlogger.Issue)
+                self.assertEqual(issue["status"]["name"], "Resolved")
+                self.assertEqual(root["total_count"], 1)
+        with patch.dict(os.environ, {"REDMINE_API_KEY": "secret"}), \
+                patch.object(backlogger, "retry_request", return_value=make_response(b"")):
+            self.assertIsNone(real_json_rest("GET", "https://example.com/issues.json", compact=True))
+
+
+def make_response(body, encoding=None):
+    headers = {"Content-Type": "application/json"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    r = requests.Response()
+    r.status_code = 200
+    r.raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=200, preload_content=False)
+    r.headers.update(headers)
+    return r